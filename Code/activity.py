@@ -1,29 +1,43 @@
+import random
+from numbers import Integral
 import numpy as np
 
 class Activity:
     """ Class which defines Activitys within the park simulation. Stores activity characteristics, current state and log. """
 
-    def __init__(self, activity_characteristics, random_seed=None):
+    __slots__ = (
+        "activity_characteristics", "history", "random_seed", "activity_id", "name", "popularity", "mean_time", "rng",
+        "visitors", "visitor_time_remaining", "total_visitors", "visitor_index",
+    )
+
+    def __init__(self, activity_characteristics, random_seed=None, activity_id=None):
         """  
         Required Inputs:
             activity_characteristics: dictionary of characteristics for the activity        
+        Optional Inputs:
+            random_seed: seeds stay time generation
+            activity_id: integer id the park and its agents use to refer to the activity
         """
 
         self.activity_characteristics = activity_characteristics
-        self.state = {} # characterizes activity current state
+        self.activity_id = activity_id
         self.history = {} 
         self.random_seed = random_seed
 
-        if (
-            type(self.activity_characteristics["popularity"]) != int 
-            or self.activity_characteristics["popularity"] < 0
-            or self.activity_characteristics["popularity"] > 10
-        ):
+        self.validate_characteristics(activity_characteristics=activity_characteristics)
+        self.initialize_activity()
+
+    @staticmethod
+    def validate_characteristics(activity_characteristics):
+        """ Checks that the activity's popularity is an integer between 0 and 10. numpy integers are accepted,
+        booleans are not. """
+
+        popularity = activity_characteristics["popularity"]
+        if not isinstance(popularity, Integral) or isinstance(popularity, bool) or not 0 <= popularity <= 10:
             raise AssertionError(
-                f"activity {self.activity_characteristics['name']} 'popularity' value must be an integer between"
-                "1 and 10"
+                f"activity {activity_characteristics['name']} 'popularity' value must be an integer between "
+                "0 and 10"
             )
-        self.initialize_activity()
 
     
     def initialize_activity(self):
@@ -34,73 +48,80 @@ class Activity:
         self.popularity = self.activity_characteristics["popularity"]
         self.mean_time = self.activity_characteristics["mean_time"]
        
-        #state
-        self.state["visitors"] = []
-        self.state["visitor_time_remaining"] = []
+        # single generator reused for every stay time draw, keyed by the activity name so each activity gets its
+        # own stream, a string key also keeps it apart from the integer seeds the park and agents use
+        self.rng = random.Random(f"{self.random_seed}-activity-{self.name}" if self.random_seed is not None else None)
+
+        #state, visitors and their remaining time are stored as parallel arrays where only the
+        # first total_visitors entries are in use, storage is doubled whenever it fills up
+        self.visitors = np.zeros(64, dtype=np.int64)
+        self.visitor_time_remaining = np.zeros(64, dtype=np.int32)
+        self.total_visitors = 0
+        # maps agent id to its positions in the visitor arrays, an agent riding with an expedited
+        # pass can start a new visit before an earlier one ends so an id can appear more than once
+        self.visitor_index = {}
 
         # history
         self.history["total_vistors"] = {}
            
 
-    def add_to_activity(self, agent_id, expedited_return_time):
+    def add_to_activity(self, agent_id, time_until_expedited_return):
         """ Adds an agent to the activity and generates the time they will spend there. """
 
-        self.state["visitors"].append(agent_id)
-
-        if self.random_seed:
-            rng = np.random.default_rng(self.random_seed+agent_id)
-            stay_time = int(
-                max((rng.normal(self.mean_time, self.mean_time/2, 1))[0], 1)
-            )
-        else:
-            stay_time = int(
-                max((np.random.normal(self.mean_time, self.mean_time/2, 1))[0], 1)
-            )
+        stay_time = int(max(self.rng.gauss(self.mean_time, self.mean_time/2), 1))
         
         # if agent has is waiting in exp queue, make them leave before they need to board ride
-        if expedited_return_time:
-            stay_time = min(max(1, min(expedited_return_time)), stay_time)
-        
-        self.state["visitor_time_remaining"].append(stay_time)
+        if time_until_expedited_return is not None:
+            stay_time = min(max(1, time_until_expedited_return), stay_time)
+
+        total_visitors = self.total_visitors
+        if total_visitors == len(self.visitors):
+            self.visitors = np.resize(self.visitors, total_visitors*2)
+            self.visitor_time_remaining = np.resize(self.visitor_time_remaining, total_visitors*2)
+
+        self.visitors[total_visitors] = agent_id
+        self.visitor_time_remaining[total_visitors] = stay_time
+        self.visitor_index.setdefault(agent_id, []).append(total_visitors)
+        self.total_visitors += 1
 
     def force_exit(self, agent_id):
         """ Handles case where agent is forced to leave an activity to get on their
         expedited queue attraction """
 
-        ind = self.state["visitors"].index(agent_id)
-        del self.state["visitors"][ind]
-        del self.state["visitor_time_remaining"][ind]
+        self.remove_visitor(ind=self.visitor_index[agent_id][0])
+
+    def remove_visitor(self, ind):
+        """ Removes the visitor at position ind by moving the last visitor into its place """
+
+        agent_id = int(self.visitors[ind])
+        positions = self.visitor_index[agent_id]
+        positions.remove(ind)
+        if not positions:
+            del self.visitor_index[agent_id]
+
+        last_ind = self.total_visitors - 1
+        if ind != last_ind:
+            last_agent_id = int(self.visitors[last_ind])
+            self.visitors[ind] = last_agent_id
+            self.visitor_time_remaining[ind] = self.visitor_time_remaining[last_ind]
+            last_positions = self.visitor_index[last_agent_id]
+            last_positions[last_positions.index(last_ind)] = ind
+        self.total_visitors = last_ind
 
     def step(self, time):
         """ Handles the following actions:
             - Allows agents to exit activity if they've spent all their time there
+            - Passes 1 minute of time for the agents who remain
         """
 
-        exiting_agents = [
-            (ind, agent_id) for ind, agent_id in enumerate(self.state["visitors"])
-            if self.state["visitor_time_remaining"][ind] == 0
-        ]
-
-        # remove from visitor list, going in reverse maintins indices
-        exiting_agents.reverse()
-        for ind, agent_id in exiting_agents:
-            del self.state["visitors"][ind]
-            del self.state["visitor_time_remaining"][ind]
+        # count every visitor down in one pass, those who had no time left are now below zero
+        times = self.visitor_time_remaining[:self.total_visitors]
+        times -= 1
+        exiting_inds = np.flatnonzero(times < 0)
+        exiting_agents = self.visitors[exiting_inds].tolist()
 
-        exiting_agents = [agent_id for ind, agent_id in exiting_agents]
+        # remove in reverse so the visitors moved into freed positions are never ones still exiting
+        for ind in exiting_inds[::-1].tolist():
+            self.remove_visitor(ind=ind)
 
         return exiting_agents
-
-    def pass_time(self):
-        """ Pass 1 minute of time """
-
-        self.state["visitor_time_remaining"] = [visitor_time-1 for visitor_time in self.state["visitor_time_remaining"]]
-
-    def store_history(self, time):
-        """ Stores metrics """
-
-        self.history["total_vistors"].update(
-            {
-                time: len(self.state["visitors"])
-            }
-        ) 
\ No newline at end of file
@@ -1,21 +1,70 @@
 import random
+from itertools import accumulate
+
 import numpy as np
 
-from behavior_reference import BEHAVIOR_ARCHETYPE_PARAMETERS
+from behavior_reference import BEHAVIOR_ARCHETYPE_PARAMETERS, ARCHETYPES
+
+AGE_CLASSES = ("no_child_rides", "no_adult_rides", "no_preference")
+# cumulative age class weights for each behavior archetype, in the order of AGE_CLASSES
+AGE_CLASS_CUM_WEIGHTS = {
+    behavior_archetype: list(
+        accumulate(behavior_dict[f"percent_{age_class}"] for age_class in AGE_CLASSES)
+    )
+    for behavior_archetype, behavior_dict in BEHAVIOR_ARCHETYPE_PARAMETERS.items()
+}
+
+# current_location holds an attraction or activity id, or one of these when the agent is at neither
+GATE = -1
+OUTSIDE_PARK = -2
 
 class Agent:
     """ Class which defines agents within the park simulation. Stores agent characteristics, current state and log. """
 
-    def __init__(self, random_seed):
+    # agents are numerous and their state is read every minute, slots give fast fixed attribute access
+    __slots__ = (
+        # identity and log
+        "agent_id", "log", "log_events", "random_seed", "rng", "activity_distribution", "eligible_attractions",
+        # current state
+        "arrival_time", "exit_time", "within_park", "current_location", "current_action",
+        "expedited_return_time", "min_expedited_return_time", "expedited_pass", "expedited_pass_index",
+        "expedited_pass_ability", "exp_wait_threshold", "exp_limit", "attraction_index", "attractions_completed",
+        "uncompleted_attractions",
+        "activities", "age_class",
+        # behavior
+        "behavior_archetype", "stay_time_preference", "allow_repeats", "attraction_preference", "wait_threshold",
+    )
+
+    def __init__(self, random_seed, log_events=True):
         """  """
 
         self.agent_id = None # unique identification number for agent
-        self.state = {} # characterizes agents current state
-        self.log = "" # logs agent history as text
+        self.log = [] # logs agent history as a list of text events
+        self.log_events = log_events # when False nothing is written to the log
+        self.random_seed = random_seed
+        self.rng = None # agent's normal number generator, created in initialize_agent
+        self.activity_distribution = None # activity ids and cumulative popularity, built on first use
+        self.eligible_attractions = None # attraction ids allowed by the agent's age class, built on first use
+        self.attraction_index = None # maps attraction name to its id, the position in attractions_completed
+        self.attractions_completed = None # times each attraction was completed, built in initialize_agent
+        self.activities = None # activity history, built in initialize_agent
+
+    def reset(self, random_seed, log_events=True):
+        """ Clears everything left over from a previous park run so a pooled agent can be initialized again """
+
+        self.log.clear()
+        self.log_events = log_events
         self.random_seed = random_seed
+        self.activity_distribution = None
+        self.eligible_attractions = None
 
-        for behavior_type, behavior_dict in BEHAVIOR_ARCHETYPE_PARAMETERS.items():
-            age_class_sum = behavior_dict["percent_no_child_rides"] + behavior_dict["percent_no_adult_rides"] + behavior_dict["percent_no_preference"]
+    @staticmethod
+    def validate_behavior_archetypes():
+        """ Checks that every behavior archetype's age class percentages add up to 1. Only needs to run once
+        before agents are generated. """
+
+        for behavior_type, archetype in ARCHETYPES.items():
+            age_class_sum = archetype.percent_no_child_rides + archetype.percent_no_adult_rides + archetype.percent_no_preference
             # deal with fuzzy float addition
             if not 0.98 <= age_class_sum <= 1.0:
                 raise AssertionError(
@@ -30,52 +79,51 @@ class Agent:
         exp_wait_threshold,
         exp_limit,
         agent_id, 
-        attraction_names, 
+        attraction_index, 
         activity_names
     ):
-        """ Takes a dictionary of the agent behavior distributions, the agents unique id, a list of all attractions, and
-        a list of all activities (non-attraction things to do at park). Initializes the agents characteristics, current state
-        and their log. """
+        """ Takes a dictionary of the agent behavior distributions, the agents unique id, a dictionary mapping each
+        attraction name to its id (shared by all agents), and a list of all activities (non-attraction things to do
+        at park). Initializes the agents characteristics, current state and their log. """
 
         self.agent_id = agent_id
 
         # initialize agent state
-        self.state.update(
-            {
-                "arrival_time": None, 
-                "exit_time": None, 
-                "within_park": False, 
-                "current_location": None,
-                "current_action": None,
-                "time_spent_at_current_location": 0,
-                "expedited_return_time": [],
-                "expedited_pass": [],
-                "expedited_pass_ability": exp_ability,
-                "exp_wait_threshold": exp_wait_threshold,
-                "exp_limit": exp_limit
-            }
-        )
-        # initialize attraction history
-        self.state.update(
-            {
-                "attractions": {
-                    attraction: {
-                        "times_completed": 0,
-                    } for attraction in attraction_names
-                }
-            }
-        )
+        self.arrival_time = None
+        self.exit_time = None
+        self.within_park = False
+        self.current_location = None
+        self.current_action = None
+        # minute of the day the agent is due back at each expedited pass attraction, stored as absolute
+        # times so nothing needs to count down each minute
+        self.expedited_return_time = []
+        self.min_expedited_return_time = None # earliest expedited return time, None when holding no passes
+        self.expedited_pass = [] # attraction ids
+        self.expedited_pass_index = {} # maps attraction id to its position in expedited_pass
+        self.expedited_pass_ability = exp_ability
+        self.exp_wait_threshold = exp_wait_threshold
+        self.exp_limit = exp_limit
+
+        # initialize attraction history, a pooled agent reuses its array when the attractions are unchanged
+        if self.attraction_index == attraction_index:
+            self.attractions_completed[:] = 0
+        else:
+            self.attractions_completed = np.zeros(len(attraction_index), dtype=np.int16)
+        self.attraction_index = attraction_index
+        # ids of attractions never ridden, kept in sync with attractions_completed
+        self.uncompleted_attractions = set(attraction_index.values())
         # initialize activity history
-        self.state.update(
-            {
-                "activities": {
-                    activity: {
-                        "times_visited": 0,
-                        "time_spent": 0,
-                    } for activity in activity_names
-                }
+        if self.activities is not None and list(self.activities) == list(activity_names):
+            for activity_history in self.activities.values():
+                activity_history["times_visited"] = 0
+                activity_history["time_spent"] = 0
+        else:
+            self.activities = {
+                activity: {
+                    "times_visited": 0,
+                    "time_spent": 0,
+                } for activity in activity_names
             }
-        )
 
         # initialize agent behavior
         behavior_archetype = self.select_behavior_archetype(
@@ -83,73 +131,62 @@ class Agent:
             agent_id=agent_id,
         )
 
-        self.state.update(
-            {
-                "age_class": self.select_age_class(
-                    agent_id=agent_id,
-                    behavior_archetype_dict=BEHAVIOR_ARCHETYPE_PARAMETERS[behavior_archetype]
-                )
-            }
+        self.age_class = self.select_age_class(
+            agent_id=agent_id,
+            behavior_archetype=behavior_archetype
         )
-        if not self.state["age_class"]:
+        if not self.age_class:
             assert True is False
 
-        parameters = BEHAVIOR_ARCHETYPE_PARAMETERS[behavior_archetype]
-        rng = np.random.default_rng(self.random_seed+self.agent_id)
+        archetype = ARCHETYPES[behavior_archetype]
+        # agent keeps its own generator, seeded once, for every normal draw it makes. a string key per agent keeps
+        # it apart from the park's integer seeded generators and from the activities' streams
+        rng_seed = f"{self.random_seed}-agent-{self.agent_id}" if self.random_seed is not None else None
+        if self.rng is None:
+            self.rng = random.Random(rng_seed)
+        else:
+            self.rng.seed(rng_seed)
         stay_time_preference = int(
-            max((rng.normal(parameters["stay_time_preference"], parameters["stay_time_preference"]/4, 1))[0], 0)
+            max(self.rng.gauss(archetype.stay_time_preference, archetype.stay_time_preference/4), 0)
         )
 
-        self.behavior = {
-            "archetype": behavior_archetype,
-            "stay_time_preference": stay_time_preference,
-            "allow_repeats": parameters["allow_repeats"],
-            "attraction_preference": parameters["attraction_preference"],
-            "wait_threshold": parameters["wait_threshold"],
-        }
+        self.behavior_archetype = behavior_archetype
+        self.stay_time_preference = stay_time_preference
+        self.allow_repeats = archetype.allow_repeats
+        self.attraction_preference = archetype.attraction_preference
+        self.wait_threshold = archetype.wait_threshold
 
     def select_behavior_archetype(self, agent_id, behavior_archetype_distribution):
         """ Selects a behavior_archetype based off of the behavior_archetype_distribution. """
 
-        rng = random.uniform(0, sum(behavior_archetype_distribution.values()))
-        floor = 0.0
-        for behavior_archetype, behavior_archetype_weight in behavior_archetype_distribution.items():
-            floor += behavior_archetype_weight
-            if rng < floor: 
-                return behavior_archetype
+        return random.choices(
+            list(behavior_archetype_distribution.keys()),
+            cum_weights=list(accumulate(behavior_archetype_distribution.values())),
+        )[0]
     
-    def select_age_class(self, agent_id, behavior_archetype_dict):
-        """ Selects a behavior_archetype based off of the behavior_archetype_distribution. """
+    def select_age_class(self, agent_id, behavior_archetype):
+        """ Selects an age class based off of the behavior_archetype's age class distribution. """
 
-        age_class_distribution = {
-            "no_child_rides": behavior_archetype_dict["percent_no_child_rides"],
-            "no_adult_rides": behavior_archetype_dict["percent_no_adult_rides"],
-            "no_preference": behavior_archetype_dict["percent_no_preference"]
-        }
-        rng = random.uniform(0, sum(age_class_distribution.values()))
-        floor = 0.0
-        for age_class, age_class_weight in age_class_distribution.items():
-            floor += age_class_weight
-            if rng < floor: 
-                return age_class
+        return random.choices(AGE_CLASSES, cum_weights=AGE_CLASS_CUM_WEIGHTS[behavior_archetype])[0]
 
     def arrive_at_park(self, time):
         """ Takes a time (mins). Updates the Agent state and log to reflect arrival at the park """
 
-        self.state["within_park"] = True
-        self.state["arrival_time"] = time
-        self.state["current_location"] = "gate"
-        self.state["current_action"] = "idling"
-        self.state["time_spent_at_current_location"] = 0
-        self.log += f"Agent arrived at park at time {time}. "
+        self.within_park = True
+        self.arrival_time = time
+        self.current_location = GATE
+        self.current_action = "idling"
+        if self.log_events:
+            self.log.append(f"Agent arrived at park at time {time}. ")
 
-    def make_state_change_decision(self, attractions_dict, activities_dict, time, park_closed):
-        """  When an agent is idle allow them to make a decison about what to do next. """
+    def make_state_change_decision(self, attractions, activities, attraction_wait_times, time, park_closed):
+        """  When an agent is idle allow them to make a decison about what to do next. Takes lists of the park's
+        attractions, activities and current attraction wait times indexed by id, and returns the action with the
+        Attraction or Activity it applies to. """
 
         # always leave park if the park is closed
         if park_closed:
-            action = "leaving"
-            location = "gate"
+            return "leaving", GATE
 
         # decide if they want to leave
         action, location = self.decide_to_leave_park(time=time)
@@ -157,37 +194,41 @@ class Agent:
         if not action:
             # make decisions while holding an expedited pass
             action, location = self.make_attraction_activity_decision(
-                activities_dict=activities_dict,
-                attractions_dict=attractions_dict,
+                activities=activities,
+                attractions=attractions,
+                attraction_wait_times=attraction_wait_times,
+                time=time,
             )
 
         return action, location
 
-    def make_attraction_activity_decision(self, activities_dict, attractions_dict):
+    def make_attraction_activity_decision(self, activities, attractions, attraction_wait_times, time):
         """ Decide what to do """
 
         desired_decision_type, valid_attractions = self.decide_attraction_or_activity(
-            attractions_dict=attractions_dict,
+            attractions=attractions,
         )
         # select activity
         if desired_decision_type == "activity":
-            selected_activity = self.select_activity_decision(activities_dict=activities_dict)
-            action, location = "traveling", selected_activity
+            selected_activity = self.select_activity_decision(activities=activities)
+            action, location = "traveling", activities[selected_activity]
         # try to select attraction
         else:
             action, location = self.select_attraction_decision(
                 valid_attractions=valid_attractions,
-                attractions_dict=attractions_dict,
+                attractions=attractions,
+                attraction_wait_times=attraction_wait_times,
+                time=time,
             )
             # only default to activity if all wait times are too long for agent and
             # no exp passes are available
             if not action:
-                selected_activity = self.select_activity_decision(activities_dict=activities_dict)
-                action, location = "traveling", selected_activity
+                selected_activity = self.select_activity_decision(activities=activities)
+                action, location = "traveling", activities[selected_activity]
         
         return action, location
 
-    def decide_attraction_or_activity(self, attractions_dict):
+    def decide_attraction_or_activity(self, attractions):
         """ Agent decides if the want to visit an attraction or activity. The agent will decide between
         an attraction or activity. If they select an activity that's it. If the select an attraction they
         see if an valid attractions exist for them to visit, while considering there attraction visit
@@ -195,53 +236,20 @@ class Agent:
         an activity. """
 
         coinflip = random.uniform(0, 1)
-        if coinflip <= self.behavior["attraction_preference"]:
+        if coinflip <= self.attraction_preference:
+            if self.eligible_attractions is None:
+                self.eligible_attractions = self.get_eligible_attractions(attractions=attractions)
+
             # determine which attractions agent is eligible for
-            if self.behavior["allow_repeats"]:
-                valid_attractions = [
-                    attraction for attraction in attractions_dict.keys() 
-                    if attraction not in self.state["expedited_pass"]
-                ]
-                if self.state["age_class"] == "no_child_rides":
-                    valid_attractions = [
-                        attraction for attraction in valid_attractions
-                        if (
-                            (attractions_dict[attraction].child_eligible and attractions_dict[attraction].adult_eligible)
-                            or (attractions_dict[attraction].adult_eligible and not attractions_dict[attraction].child_eligible)
-                        )
-                    ]
-                    
-                elif self.state["age_class"] == "no_adult_rides":
-                    valid_attractions = [
-                        attraction for attraction in valid_attractions
-                        if (
-                            (attractions_dict[attraction].child_eligible and attractions_dict[attraction].adult_eligible)
-                            or (attractions_dict[attraction].child_eligible and not attractions_dict[attraction].adult_eligible)
-                        )
-                    ]
-                    
+            if self.allow_repeats:
+                valid_attractions = {
+                    attraction for attraction in self.eligible_attractions
+                    if attraction not in self.expedited_pass_index
+                }
             else:
-                valid_attractions = [
-                    attraction for attraction, attractions_history in self.state["attractions"].items()
-                    if attractions_history["times_completed"] == 0 and attraction not in self.state["expedited_pass"]
-                ]
-                if self.state["age_class"] == "no_child_rides":
-                    valid_attractions = [
-                        attraction for attraction in valid_attractions
-                        if (
-                            (attractions_dict[attraction].child_eligible and attractions_dict[attraction].adult_eligible)
-                            or (attractions_dict[attraction].adult_eligible and not attractions_dict[attraction].child_eligible)
-                        )
-                    ]
-                    
-                elif self.state["age_class"] == "no_adult_rides":
-                    valid_attractions = [
-                        attraction for attraction in valid_attractions
-                        if (
-                            (attractions_dict[attraction].child_eligible and attractions_dict[attraction].adult_eligible)
-                            or (attractions_dict[attraction].child_eligible and not attractions_dict[attraction].adult_eligible)
-                        )
-                    ]
+                valid_attractions = self.uncompleted_attractions.intersection(
+                    self.eligible_attractions
+                ).difference(self.expedited_pass)
             if len(valid_attractions) == 0:
                 desired_decision_type = "activity"
                 valid_attractions = []
@@ -254,51 +262,46 @@ class Agent:
 
         return desired_decision_type, valid_attractions
 
-    def select_attraction_decision(self, valid_attractions, attractions_dict):
-        """ Selects an attraction to visit based off of the attraction popularity """
+    def get_eligible_attractions(self, attractions):
+        """ Returns the ids of attractions the agent's age class allows them to ride. Eligibility never changes, so
+        this is only computed once per agent. """
+
+        if self.age_class == "no_child_rides":
+            return frozenset(attraction.attraction_id for attraction in attractions if attraction.adult_eligible)
+        if self.age_class == "no_adult_rides":
+            return frozenset(attraction.attraction_id for attraction in attractions if attraction.child_eligible)
+        return frozenset(attraction.attraction_id for attraction in attractions)
 
-        # get valid attraction wait times
-        attraction_wait_times = {
-            attraction_name: attraction.get_wait_time() 
-            for attraction_name, attraction in attractions_dict.items()
-            if attraction_name in attractions_dict
-        }
+    def select_attraction_decision(self, valid_attractions, attractions, attraction_wait_times, time):
+        """ Selects an attraction to visit based off of the attraction popularity. attraction_wait_times is
+        maintained by the park so it isn't recomputed for every decision. """
+
+        # popularity distribution for valid attractions, attractions are dropped from it as they are rejected
+        attraction_ids = sorted(valid_attractions)
+        attraction_weights = [attractions[attraction_id].popularity for attraction_id in attraction_ids]
 
         action, location = None, None
-        step_rng = 0 
-        while len(valid_attractions) > 0 and not action:
-            step_rng += 1
-            # generate popularity distribution for valid attractions
-            attraction_popularity_distribution = {
-                attraction_name: parameters.popularity for attraction_name, parameters in attractions_dict.items()
-                if attraction_name in valid_attractions 
-            }
-            rng = random.uniform(0, sum(attraction_popularity_distribution.values()))
-            floor, ceiling = 0.0, 0.0
-            for attraction, attraction_weight in attraction_popularity_distribution.items():
-                ceiling += attraction_weight
-                if floor < rng <= ceiling: 
-                    desired_attraction = attraction
-                floor += attraction_weight
+        while len(attraction_ids) > 0 and not action:
+            desired_attraction = attractions[random.choices(attraction_ids, weights=attraction_weights)[0]]
+            wait_time = attraction_wait_times[desired_attraction.attraction_id]
 
             if (
-                attraction_wait_times[desired_attraction] > self.state["exp_wait_threshold"]
-                and self.state["expedited_pass_ability"]
-                and len(self.state["expedited_pass"]) < self.state["exp_limit"]
-                and attractions_dict[desired_attraction].expedited_queue 
-                and attractions_dict[desired_attraction].exp_queue_passes > 0
+                wait_time > self.exp_wait_threshold
+                and self.expedited_pass_ability
+                and len(self.expedited_pass) < self.exp_limit
+                and desired_attraction.expedited_queue 
+                and desired_attraction.exp_queue_passes > 0
             ): 
                 action, location = "get pass", desired_attraction
             elif (
-                attraction_wait_times[desired_attraction] 
-                > (self.behavior["wait_threshold"] + (attractions_dict[desired_attraction].popularity * 6))
-            ):
-                valid_attractions.remove(desired_attraction)
-            elif any(
-                rt < attraction_wait_times[desired_attraction] + attractions_dict[desired_attraction].run_time
-                for rt in self.state["expedited_return_time"]
+                wait_time > (self.wait_threshold + (desired_attraction.popularity * 6))
+            ) or (
+                self.min_expedited_return_time is not None
+                and self.min_expedited_return_time - time < wait_time + desired_attraction.run_time
             ):
-                valid_attractions.remove(desired_attraction)
+                ind = attraction_ids.index(desired_attraction.attraction_id)
+                del attraction_ids[ind]
+                del attraction_weights[ind]
             else:
                 action, location = "traveling", desired_attraction
         
@@ -309,142 +312,174 @@ class Agent:
         otherwise agents will look at how long they have been at the park and how long they prefer to stay to make
         this decision """
 
-        action, location = None, None
+        if time == self.arrival_time:
+            return None, None
 
         # determine if they should leave park, the larger this number is the more likely they are to leave
-        if time != self.state["arrival_time"]:
-            actual_preference_value = (time - self.state["arrival_time"]) - self.behavior["stay_time_preference"]           
-            rng = np.random.default_rng(self.random_seed+self.agent_id+time)
-            normal_coinflip = (rng.normal(0, 1, 1) * 60)[0]
-            if actual_preference_value > normal_coinflip:
-                action = "leaving"
-                location = "gate"
+        actual_preference_value = (time - self.arrival_time) - self.stay_time_preference
+        # the coinflip is a normal with a standard deviation of 60, an agent more than 6 deviations short of their
+        # preference will practically never leave so skip the draw
+        if actual_preference_value < -360:
+            return None, None
 
-        return action, location
+        normal_coinflip = self.rng.gauss(0, 1) * 60
+        if actual_preference_value > normal_coinflip:
+            return "leaving", GATE
+
+        return None, None
     
-    def select_activity_decision(self, activities_dict):
-        """ Selects an activity to visit based off of the activity popularity. """
-
-        activity_popularity_distribution = {
-            activity: parameters.popularity for activity, parameters in activities_dict.items()
-        }
-        rng = random.uniform(0, sum(activity_popularity_distribution.values()))
-        floor = 0.0
-        for activity, activity_weight in activity_popularity_distribution.items():
-            floor += activity_weight
-            if rng < floor: 
-                return activity
+    def select_activity_decision(self, activities):
+        """ Selects an activity id to visit based off of the activity popularity. """
+
+        if not self.activity_distribution:
+            self.activity_distribution = (
+                [activity.activity_id for activity in activities],
+                list(accumulate(activity.popularity for activity in activities)),
+            )
+        activity_ids, activity_cum_weights = self.activity_distribution
+        return random.choices(activity_ids, cum_weights=activity_cum_weights)[0]
     
-    def pass_time(self):
-        """ Pass 1 minute of time """
-        if self.state["within_park"]:
-            self.state["time_spent_at_current_location"] += 1
-            if self.state["expedited_pass"]:
-                self.state["expedited_return_time"] = [val-1 for val in self.state["expedited_return_time"]]
+    def get_log(self):
+        """ Returns the agent's log as text """
+
+        return "".join(self.log)
 
     # ACTIONS
     def leave_park(self, time):
         """ Updates agent state when they leave park """
 
-        self.state["within_park"] = False
-        self.state["current_location"] = "outside park"
-        self.state["current_action"] = None
-        self.state["exit_time"] = time
-        self.state["time_spent_at_current_location"] = 0
-        self.log += f"Agent left park at {time}. "
+        self.within_park = False
+        self.current_location = OUTSIDE_PARK
+        self.current_action = None
+        self.exit_time = time
+        if self.log_events:
+            self.log.append(f"Agent left park at {time}. ")
 
     def enter_queue(self, attraction, time):
         """ Updates agent state when they enter an attraction queue """
 
-        self.state["current_location"] = attraction
-        self.state["current_action"] = "queueing"
-        self.state["time_spent_at_current_location"] = 0
-        self.log += f"Agent entered queue for {attraction} at time {time}. "
+        self.current_location = attraction.attraction_id
+        self.current_action = "queueing"
+        if self.log_events:
+            self.log.append(f"Agent entered queue for {attraction.name} at time {time}. ")
 
     def begin_activity(self, activity, time):
         """ Updates agent state when they visit an activity """
 
-        self.state["current_location"] = activity
-        self.state["current_action"] = "browsing"
-        self.state["time_spent_at_current_location"] = 0
-        self.log += f"Agent visited the activity {activity} at time {time}. "
+        self.current_location = activity.activity_id
+        self.current_action = "browsing"
+        if self.log_events:
+            self.log.append(f"Agent visited the activity {activity.name} at time {time}. ")
 
     def get_pass(self, attraction, time):
         """ Updates agent state when the get a pass """
 
-        self.state["current_location"] = "gate"
-        self.state["current_action"] = "getting pass"
-        self.state["expedited_pass"].append(attraction)
-        self.state["time_spent_at_current_location"] = 0
-        self.log += (
-            f"Agent picked up an expedited pass for {attraction} at time {time}. "
-        )
+        self.current_location = GATE
+        self.current_action = "getting pass"
+        self.expedited_pass_index[attraction.attraction_id] = len(self.expedited_pass)
+        self.expedited_pass.append(attraction.attraction_id)
+        if self.log_events:
+            self.log.append(
+                f"Agent picked up an expedited pass for {attraction.name} at time {time}. "
+            )
     
-    def assign_expedited_return_time(self, expedited_wait_time):
+    def assign_expedited_return_time(self, expedited_wait_time, time):
         """ Updates agent state when are assigned a return time to their expedited attraction """
 
-        self.state["expedited_return_time"].append(expedited_wait_time)
-        self.state["current_action"] = "idling"
-        self.log += (
-            f"The estimated expedited queue wait time is {expedited_wait_time} minutes. "
-        )
+        return_time = time + expedited_wait_time
+        self.expedited_return_time.append(return_time)
+        if self.min_expedited_return_time is None or return_time < self.min_expedited_return_time:
+            self.min_expedited_return_time = return_time
+        self.current_action = "idling"
+        if self.log_events:
+            self.log.append(
+                f"The estimated expedited queue wait time is {expedited_wait_time} minutes. "
+            )
         
     def return_exp_pass(self, attraction):
         """ Updates agent state when they leave park before using the pass """
 
-        ind_to_remove = None
-        for ind, attraction_pass in enumerate(self.state["expedited_pass"]):
-            if attraction_pass == attraction:
-                ind_to_remove = ind
-
-        del self.state["expedited_pass"][ind_to_remove]
-        del self.state["expedited_return_time"][ind_to_remove]
+        self.remove_expedited_pass(attraction_id=attraction.attraction_id)
 
-        self.log += (
-            f"Agent decided to leave park and returned the expedited pass. "
-        )
+        if self.log_events:
+            self.log.append(
+                f"Agent decided to leave park and returned the expedited pass. "
+            )
 
-    def agent_exited_attraction(self, name, time):
+    def remove_expedited_pass(self, attraction_id):
+        """ Removes a pass and its return time by moving the last pass into its position """
+
+        ind = self.expedited_pass_index.pop(attraction_id)
+        last_ind = len(self.expedited_pass) - 1
+        if ind != last_ind:
+            last_attraction = self.expedited_pass[last_ind]
+            self.expedited_pass[ind] = last_attraction
+            self.expedited_return_time[ind] = self.expedited_return_time[last_ind]
+            self.expedited_pass_index[last_attraction] = ind
+        self.expedited_pass.pop()
+        self.expedited_return_time.pop()
+        self.min_expedited_return_time = min(self.expedited_return_time, default=None)
+
+    def agent_exited_attraction(self, attraction, time):
         """ Update agents state after they leave an attraction """
 
-        self.state["current_location"] = "gate"
-        self.state["current_action"] = "idling"
-        self.state["attractions"][name]["times_completed"] += 1
-        self.state["time_spent_at_current_location"] = 0
+        self.current_location = GATE
+        self.current_action = "idling"
+        self.attractions_completed[attraction.attraction_id] += 1
+        self.uncompleted_attractions.discard(attraction.attraction_id)
 
-        self.log += f"Agent exited {name} at time {time}. "
+        if self.log_events:
+            self.log.append(f"Agent exited {attraction.name} at time {time}. ")
 
-    def agent_boarded_attraction(self, name, time):
+    def agent_boarded_attraction(self, attraction, time):
         """ Update agents state after they board an attraction """
-        if name in self.state["expedited_pass"]:
-            ind_to_remove = None
-            for ind, attraction_pass in enumerate(self.state["expedited_pass"]):
-                if attraction_pass == name:
-                    ind_to_remove = ind
-
-            if ind_to_remove != None:
-                del self.state["expedited_pass"][ind_to_remove]
-                del self.state["expedited_return_time"][ind_to_remove]
-
-            self.state["current_location"] = name
-            self.state["current_action"] = "riding"
-            self.state["time_spent_at_current_location"] = 0
-            self.log += (
-                f"Agent boarded {name} and redeemed their expedited queue pass at time {time}. "
-            )
+        if attraction.attraction_id in self.expedited_pass_index:
+            self.remove_expedited_pass(attraction_id=attraction.attraction_id)
+
+            self.current_location = attraction.attraction_id
+            self.current_action = "riding"
+            if self.log_events:
+                self.log.append(
+                    f"Agent boarded {attraction.name} and redeemed their expedited queue pass at time {time}. "
+                )
             return True
         else:
-            self.state["current_location"] = name
-            self.state["current_action"] = "riding"
-            self.state["time_spent_at_current_location"] = 0
-            self.log += f"Agent boarded {name} at time {time}. "
+            self.current_location = attraction.attraction_id
+            self.current_action = "riding"
+            if self.log_events:
+                self.log.append(f"Agent boarded {attraction.name} at time {time}. ")
             return False
 
-    def agent_exited_activity(self, name, time):
+    def agent_exited_activity(self, activity, time):
         """ Update agents state after they leave an activity """
 
-        self.state["current_location"] = "gate"
-        self.state["current_action"] = "idling"
-        self.state["activities"][name]["times_visited"] += 1
-        self.state["time_spent_at_current_location"] = 0
-        self.log += f"Agent exited the activity {name} at time {time}. "
\ No newline at end of file
+        self.current_location = GATE
+        self.current_action = "idling"
+        self.activities[activity.name]["times_visited"] += 1
+        if self.log_events:
+            self.log.append(f"Agent exited the activity {activity.name} at time {time}. ")
+
+
+class AgentPool:
+    """ Holds agents released by a finished park run so the next run can reuse them instead of building new
+    ones. Useful when running many simulations back to back, e.g. a parameter sweep. """
+
+    def __init__(self):
+        """  """
+
+        self.idle_agents = []
+
+    def acquire(self, random_seed, log_events=True):
+        """ Returns an idle agent reset for a new run, or a new agent if none are idle. The agent still needs
+        initialize_agent to be called. """
+
+        if self.idle_agents:
+            agent = self.idle_agents.pop()
+            agent.reset(random_seed=random_seed, log_events=log_events)
+            return agent
+        return Agent(random_seed=random_seed, log_events=log_events)
+
+    def release(self, agent):
+        """ Returns an agent to the pool """
+
+        self.idle_agents.append(agent)
@@ -1,27 +1,45 @@
+from numbers import Integral
+from collections import deque, Counter
 
 class Attraction:
     """ Class which defines Attractions within the park simulation. Stores attraction characteristics, current state and log. """
 
-    def __init__(self, attraction_characteristics):
+    __slots__ = (
+        "attraction_characteristics", "attraction_id", "history", "name", "run_time", "capacity",
+        "popularity", "child_eligible", "adult_eligible", "run_time_remaining", "expedited_queue", "exp_queue_ratio",
+        "exp_queue_passes", "exp_seats", "standby_seats", "exp_passes_per_hour", "queue_length", "exp_queue_length",
+        "agents_in_attraction", "queue", "exp_queue", "exp_queue_returned", "exp_queue_passes_distributed",
+        "queue_runs", "exp_queue_runs", "queues_changed",
+        "remaining_operating_hours", "passed_operating_hours", "remaining_hours_exp_passes", "passed_hours_exp_passes",
+        "get_wait_time", "get_exp_wait_time",
+    )
+
+    def __init__(self, attraction_characteristics, attraction_id=None):
         """  
         Required Inputs:
             attraction_characteristics: dictionary of characteristics for the attraction        
+        Optional Inputs:
+            attraction_id: integer id the park and its agents use to refer to the attraction
         """
 
         self.attraction_characteristics = attraction_characteristics
-        self.state = {} # characterizes attractions current state
+        self.attraction_id = attraction_id
         self.history = {} 
 
-        if (
-            type(self.attraction_characteristics["popularity"]) != int 
-            or self.attraction_characteristics["popularity"] < 1
-            or self.attraction_characteristics["popularity"] > 10
-        ):
+        self.validate_characteristics(attraction_characteristics=attraction_characteristics)
+        self.initialize_attraction()
+
+    @staticmethod
+    def validate_characteristics(attraction_characteristics):
+        """ Checks that the attraction's popularity is an integer between 1 and 10. numpy integers are accepted,
+        booleans are not. """
+
+        popularity = attraction_characteristics["popularity"]
+        if not isinstance(popularity, Integral) or isinstance(popularity, bool) or not 1 <= popularity <= 10:
             raise AssertionError(
-                f"Attraction {self.attraction_characteristics['name']} 'popularity' value must be an integer between"
+                f"Attraction {attraction_characteristics['name']} 'popularity' value must be an integer between "
                 "1 and 10"
             )
-        self.initialize_attraction()
 
     
     def initialize_attraction(self):
@@ -30,7 +48,10 @@ class Attraction:
         #characteristics
         self.name = self.attraction_characteristics["name"]
         self.run_time = self.attraction_characteristics["run_time"]
-        self.capacity = self.attraction_characteristics["hourly_throughput"] * (self.attraction_characteristics["run_time"]/60) 
+        # agents loaded per run, step only ever seats whole agents
+        self.capacity = (
+            self.attraction_characteristics["hourly_throughput"] * self.attraction_characteristics["run_time"]
+        ) // 60
         self.popularity = self.attraction_characteristics["popularity"]
         self.child_eligible = self.attraction_characteristics["child_eligible"]
         self.adult_eligible = self.attraction_characteristics["adult_eligible"]
@@ -38,85 +59,133 @@ class Attraction:
         self.expedited_queue = self.attraction_characteristics["expedited_queue"]
         self.exp_queue_ratio = self.attraction_characteristics["expedited_queue_ratio"]
         self.exp_queue_passes = 0
+        self.exp_seats = int(self.capacity * self.exp_queue_ratio) # seats per run devoted to the expedited queue
+        self.standby_seats = self.capacity - self.exp_seats
+        self.exp_passes_per_hour = self.capacity * (60/self.run_time) * self.exp_queue_ratio
+        # passes for the operating hours left and passed, step only recomputes them when those hours change
+        self.remaining_operating_hours = None
+        self.passed_operating_hours = None
+        self.remaining_hours_exp_passes = 0
+        self.passed_hours_exp_passes = 0
 
         #state
-        self.state["agents_in_attraction"] = []
-        self.state["queue"] = []
-        self.state["exp_queue"] = []
-        self.state["exp_queue_passes_distributed"] = 0
+        self.agents_in_attraction = []
+        # queues are loaded from the front, deques avoid copying the rest of the queue each run
+        self.queue = deque()
+        self.exp_queue = deque()
+        # how many returned passes each agent still has in exp_queue, they are skipped when loading instead of
+        # being searched for and removed. an agent can hold an entry from a pass they never redeemed as well as
+        # a newer one, so returns are counted rather than just noted
+        self.exp_queue_returned = Counter()
+        self.exp_queue_passes_distributed = 0
+        # lengths of the queues above, kept in step with them so the per minute metrics don't need len()
+        self.queue_length = 0
+        self.exp_queue_length = 0
+        # full runs ahead of the back of each queue, recounted only after the queues change
+        self.queue_runs = 0
+        self.exp_queue_runs = 0
+        self.queues_changed = False
 
         # history
         self.history["queue_length"] = {}
         self.history["queue_wait_time"] = {}
         self.history["exp_queue_length"] = {}
         self.history["exp_queue_wait_time"] = {}
+
+        # whether an attraction has an expedited queue never changes, so pick the matching wait time estimates once
+        if self.expedited_queue:
+            self.get_wait_time = self.get_wait_time_with_exp_queue
+            self.get_exp_wait_time = self.get_exp_wait_time_with_exp_queue
+        else:
+            self.get_wait_time = self.get_wait_time_without_exp_queue
+            self.get_exp_wait_time = self.get_exp_wait_time_without_exp_queue
            
 
-    def get_wait_time(self):
-        """ Returns the expected queue wait time according the the equation
+    def get_wait_time_with_exp_queue(self):
+        """ Returns the expected queue wait time according the the equation, for attractions with an expedited
+        queue. Bound to get_wait_time in initialize_attraction.
         """
 
-        if self.expedited_queue:
-            queue_len = len(self.state["queue"])
-            exp_queue_len = len(self.state["exp_queue"])
-            exp_seats = int(self.capacity * self.exp_queue_ratio)
-            standby_seats = self.capacity - exp_seats
-
-            runs = 0
-            while queue_len >= self.capacity:    
-                if exp_queue_len > exp_seats:
-                    exp_queue_len -= exp_seats
-                    if queue_len > standby_seats:
-                        queue_len -= standby_seats
-                    else:
-                        queue_len = 0
-                else:
-                    queue_len -= self.capacity - exp_queue_len
-                    exp_queue_len = 0
-                
-                runs += 1
+        if self.queues_changed:
+            self.count_queue_runs()
+        return self.queue_runs * self.run_time + self.run_time_remaining
 
-            return runs * self.run_time + self.run_time_remaining
-        else:
-            return (len(self.state["queue"]) // self.capacity) * self.run_time + self.run_time_remaining
-    
-    def get_exp_wait_time(self):
-        """ Returns the expected queue wait time according the the equation
+    def get_wait_time_without_exp_queue(self):
+        """ Returns the expected queue wait time according the the equation, for attractions without an
+        expedited queue. Bound to get_wait_time in initialize_attraction.
         """
 
-        if self.expedited_queue:
-            queue_len = len(self.state["queue"])
-            exp_queue_len = len(self.state["exp_queue"])
-            exp_seats = int(self.capacity * self.exp_queue_ratio)
-            standby_seats = self.capacity - exp_seats
-
-            runs = 0
-            while exp_queue_len >= self.capacity:    
-                if exp_queue_len > exp_seats:
-                    exp_queue_len -= exp_seats
-                    if queue_len > standby_seats:
-                        queue_len -= standby_seats
-                    else:
-                        queue_len = 0
-                else:
-                    queue_len -= self.capacity - exp_queue_len
-                    exp_queue_len = 0
-                
-                runs += 1
+        return (self.queue_length // self.capacity) * self.run_time + self.run_time_remaining
+    
+    def get_exp_wait_time_with_exp_queue(self):
+        """ Returns the expected expedited queue wait time according the the equation. Bound to
+        get_exp_wait_time in initialize_attraction.
+        """
 
-            return runs * self.run_time + self.run_time_remaining
+        if self.queues_changed:
+            self.count_queue_runs()
+        return self.exp_queue_runs * self.run_time + self.run_time_remaining
+
+    def count_queue_runs(self):
+        """ Counts the full runs ahead of an agent joining the queue and the expedited queue. These only change
+        when the queues do, the wait times add the time left in the current run. """
+
+        queue_len = self.queue_length
+        exp_queue_len = self.exp_queue_length
+        exp_seats = self.exp_seats
+        standby_seats = self.standby_seats
+
+        # each run takes exp_seats from the expedited queue until it is shorter than a full run
+        self.exp_queue_runs = 0
+        if exp_queue_len >= self.capacity and exp_seats:
+            self.exp_queue_runs = (exp_queue_len - self.capacity) // exp_seats + 1
+
+        self.queues_changed = False
+        self.queue_runs = 0
+        if queue_len < self.capacity:
+            return
+
+        # while the expedited queue fills its seats each run takes exp_seats from it and standby_seats from
+        # the queue, count the runs until either the expedited queue can no longer fill its seats or the
+        # queue is shorter than a full run
+        if exp_queue_len > exp_seats:
+            exp_queue_runs = (exp_queue_len - 1) // exp_seats if exp_seats else None
+        else:
+            exp_queue_runs = 0
+        if standby_seats:
+            queue_runs = (queue_len - self.capacity) // standby_seats + 1
+            runs = queue_runs if exp_queue_runs is None else min(queue_runs, exp_queue_runs)
         else:
-            return 0
+            runs = exp_queue_runs
+        queue_len -= runs * standby_seats
+
+        # the next run takes what is left of the expedited queue, after that the queue gets every seat
+        if queue_len >= self.capacity:
+            queue_len -= self.capacity - (exp_queue_len - runs * exp_seats)
+            runs += 1 + queue_len // self.capacity
+
+        self.queue_runs = runs
+
+    def get_exp_wait_time_without_exp_queue(self):
+        """ Attractions without an expedited queue have no expedited wait. Bound to get_exp_wait_time in
+        initialize_attraction.
+        """
+
+        return 0
     
     def add_to_queue(self, agent_id):
         """ Adds an agent to the queue """
 
-        self.state["queue"].append(agent_id)
+        self.queue.append(agent_id)
+        self.queue_length += 1
+        self.queues_changed = True
     
     def add_to_exp_queue(self, agent_id):
         """ Adds an agent to the expeditied queue """
 
-        self.state["exp_queue"].append(agent_id)
+        self.exp_queue.append(agent_id)
+        self.exp_queue_length += 1
+        self.queues_changed = True
         expedited_wait_time = self.get_exp_wait_time()
         return expedited_wait_time
 
@@ -124,14 +193,30 @@ class Attraction:
         """ Removes a expedited pass """
 
         self.exp_queue_passes -= 1
-        self.state["exp_queue_passes_distributed"] += 1
+        self.exp_queue_passes_distributed += 1
         
     def return_pass(self, agent_id):
         """ Removes an expedited pass without redeeming it """
 
         self.exp_queue_passes += 1
-        self.state["exp_queue_passes_distributed"] -= 1
-        self.state["exp_queue"].remove(agent_id)
+        self.exp_queue_passes_distributed -= 1
+        self.exp_queue_returned[agent_id] += 1
+        self.exp_queue_length -= 1
+        self.queues_changed = True
+
+        # drop returned passes from the queue once they make up a quarter of it, only the earliest copies of an
+        # agent's entries are dropped, matching what loading would have skipped
+        exp_queue = self.exp_queue
+        if (len(exp_queue) - self.exp_queue_length) * 4 > len(exp_queue):
+            exp_queue_returned = self.exp_queue_returned
+            compacted_exp_queue = deque()
+            for queued_agent_id in exp_queue:
+                if exp_queue_returned[queued_agent_id]:
+                    exp_queue_returned[queued_agent_id] -= 1
+                else:
+                    compacted_exp_queue.append(queued_agent_id)
+            self.exp_queue = compacted_exp_queue
+            exp_queue_returned.clear()
 
     def step(self, time, park_close):
         """ Handles the following actions:
@@ -149,44 +234,56 @@ class Attraction:
             if time < park_close:
                 remaining_operating_hours = (park_close - time) // 60
                 passed_operating_hours = time // 60
+                if remaining_operating_hours != self.remaining_operating_hours:
+                    self.remaining_operating_hours = remaining_operating_hours
+                    self.remaining_hours_exp_passes = self.exp_passes_per_hour * remaining_operating_hours
+                if passed_operating_hours != self.passed_operating_hours:
+                    self.passed_operating_hours = passed_operating_hours
+                    self.passed_hours_exp_passes = self.exp_passes_per_hour * passed_operating_hours
                 self.exp_queue_passes = (
-                    (self.capacity * (60/self.run_time) * self.exp_queue_ratio * remaining_operating_hours) 
-                    - max(
-                            (
-                                self.state["exp_queue_passes_distributed"] - 
-                                (self.capacity * (60/self.run_time) * self.exp_queue_ratio * passed_operating_hours)
-                            )
-                        , 0
-                    )
+                    self.remaining_hours_exp_passes
+                    - max(self.exp_queue_passes_distributed - self.passed_hours_exp_passes, 0)
                 )
             else:
                 self.exp_queue_passes = 0 
 
         if self.run_time_remaining == 0:
             # left agents off attraction
-            exiting_agents = self.state["agents_in_attraction"]
-            self.state["agents_in_attraction"] = []
+            exiting_agents = self.agents_in_attraction
             self.run_time_remaining = self.run_time
 
             # devote seats to queue and expedited queue
-            max_exp_queue_agents = int(self.capacity * self.exp_queue_ratio)
+            max_exp_queue_agents = self.exp_seats
             # Handle case where expedited queue has fewer agents than the maximum number of expedited queue spots
-            if len(self.state["exp_queue"]) < max_exp_queue_agents:
-                max_queue_agents = int(self.capacity - len(self.state["exp_queue"]))
+            if self.exp_queue_length < max_exp_queue_agents:
+                max_queue_agents = self.capacity - self.exp_queue_length
             else:
-                max_queue_agents = int(self.capacity - max_exp_queue_agents)
+                max_queue_agents = self.standby_seats
             
-            # load expeditied queue agents
-            expedited_agents_to_load = [agent_id for agent_id in self.state["exp_queue"][:max_exp_queue_agents]]
-            self.state["agents_in_attraction"] = expedited_agents_to_load
-            self.state["exp_queue"] = self.state["exp_queue"][max_exp_queue_agents:]
-
-            # load queue agents
-            agents_to_load = [agent_id for agent_id in self.state["queue"][:max_queue_agents]]
-            self.state["agents_in_attraction"].extend(agents_to_load)
-            self.state["queue"] = self.state["queue"][max_queue_agents:]
-
-            loaded_agents = self.state["agents_in_attraction"]
+            # load expeditied queue agents then queue agents straight into the attraction
+            exp_queue = self.exp_queue
+            queue = self.queue
+            total_exp_queue_agents = min(max_exp_queue_agents, self.exp_queue_length)
+            total_queue_agents = min(max_queue_agents, self.queue_length)
+            exp_queue_returned = self.exp_queue_returned
+            if exp_queue_returned:
+                loaded_agents = []
+                while len(loaded_agents) < total_exp_queue_agents:
+                    agent_id = exp_queue.popleft()
+                    if exp_queue_returned[agent_id]:
+                        exp_queue_returned[agent_id] -= 1
+                        if not exp_queue_returned[agent_id]:
+                            del exp_queue_returned[agent_id]
+                    else:
+                        loaded_agents.append(agent_id)
+            else:
+                loaded_agents = [exp_queue.popleft() for _ in range(total_exp_queue_agents)]
+            for _ in range(total_queue_agents):
+                loaded_agents.append(queue.popleft())
+            self.agents_in_attraction = loaded_agents
+            self.exp_queue_length -= total_exp_queue_agents
+            self.queue_length -= total_queue_agents
+            self.queues_changed = True
         
         return exiting_agents, loaded_agents
 
@@ -194,33 +291,3 @@ class Attraction:
         """ Pass 1 minute of time """
 
         self.run_time_remaining -= 1
-
-    def store_history(self, time):
-        """ Stores metrics """
-
-        self.history["queue_length"].update(
-            {
-                time: len(self.state["queue"])
-            }
-        ) 
-        self.history["queue_wait_time"].update(
-            {
-                time: self.get_wait_time()
-            }
-        )
-        self.history["exp_queue_length"].update(
-            {
-                time: len(self.state["exp_queue"])
-            }
-        ) 
-        self.history["exp_queue_wait_time"].update(
-            {
-                time: self.get_exp_wait_time()
-            }
-        ) 
-
-
-
-        
-
-        
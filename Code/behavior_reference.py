@@ -1,3 +1,6 @@
+from collections import namedtuple
+from types import MappingProxyType
+
 # Parameters describing behavior of Agent Archetypes
 # Parameters
     # stay_time_preference: mean total park stay time, actual value will be draw from a 
@@ -76,3 +79,25 @@ BEHAVIOR_ARCHETYPE_PARAMETERS = {
     },
 
 }
+
+# the same table as records for attribute access, the dict above stays the authored form
+Archetype = namedtuple(
+    "Archetype",
+    [
+        "stay_time_preference", "allow_repeats", "attraction_preference", "wait_threshold", "percent_no_child_rides",
+        "percent_no_adult_rides", "percent_no_preference",
+    ]
+)
+ARCHETYPES = {
+    behavior_archetype: Archetype(**behavior_dict)
+    for behavior_archetype, behavior_dict in BEHAVIOR_ARCHETYPE_PARAMETERS.items()
+}
+
+# the table is read only configuration, agent.py precomputes from it at import so edits made at runtime would be
+# silently ignored, freeze it so they fail instead
+BEHAVIOR_ARCHETYPE_PARAMETERS = MappingProxyType(
+    {
+        behavior_archetype: MappingProxyType(behavior_dict)
+        for behavior_archetype, behavior_dict in BEHAVIOR_ARCHETYPE_PARAMETERS.items()
+    }
+)
@@ -1,6 +1,9 @@
 import random
 import os
 import json
+from collections import Counter
+from operator import itemgetter
+from types import MappingProxyType
 import numpy as np
 import pandas as pd
 import seaborn as sns
@@ -8,14 +11,18 @@ import matplotlib.pyplot as plt
 
 from tabulate import tabulate
 
-from agent import Agent
+from agent import Agent, AgentPool
 from attraction import Attraction
 from activity import Activity
+from park_history import ParkHistory
 
 class Park:
     """ Park simulation class """
 
-    def __init__(self, attraction_list, activity_list, plot_range, version=1.0, random_seed=0, verbosity=0):
+    def __init__(
+        self, attraction_list, activity_list, plot_range, version=1.0, random_seed=0, verbosity=0, agent_logs=True,
+        agent_pool=None
+    ):
         """ 
         Required Inputs:
             attraction_list: list of attractions dictionaries
@@ -24,24 +31,36 @@ class Park:
             random_seed: seeds random number generation for reproduction
             version: specify the version
             verbosity: display metrics
+            agent_logs: record each agent's text log, disable to speed up large runs
+            agent_pool: AgentPool shared between park runs so agents can be reused, see release_agents
         """
 
-        # static
-        self.attraction_list = attraction_list
-        self.activity_list = activity_list
+        # static, attractions and activities are ordered by popularity and identified by their position
+        self.attraction_list = sorted(attraction_list, key=itemgetter('popularity'))
+        self.activity_list = sorted(activity_list, key=itemgetter('popularity'))
+        self.attraction_index = {attraction["name"]: ind for ind, attraction in enumerate(self.attraction_list)}
+        self.activity_index = {activity["name"]: ind for ind, activity in enumerate(self.activity_list)}
         self.plot_range = plot_range
         self.random_seed = random_seed
         self.version = version
         self.verbosity = verbosity
+        self.agent_logs = agent_logs
+        self.agent_pool = agent_pool if agent_pool is not None else AgentPool()
 
         # dynamic
-        self.schedule = {}
+        self.schedule = None # agents arriving each minute, indexed by minute
         self.agents = {}
+        self.idle_agent_ids = set() # agents within the park who are idling, updated as their actions change
         self.attractions = {}
         self.activities = {}
+        self.attractions_by_id = []
+        self.activities_by_id = []
+        self.attraction_wait_times = [] # current wait time of each attraction by id, see step
+        self.park_history = None # per minute metrics, exposed through the history dictionaries as the run progresses
         self.history = {"total_active_agents": {}, "distributed_passes": 0, "redeemed_passes": 0}
         self.time = 0
         self.arrival_index = 0
+        self.total_active_agents = 0 # agents within the park, updated as agents arrive and leave
         self.park_close = None
     
     def generate_arrival_schedule(self, arrival_seed, total_daily_agents, perfect_arrivals):
@@ -68,40 +87,41 @@ class Park:
         if operating_hours > 24:
             raise AssertionError(f"Arrival Schedule suggests park is open more than 24 hours ({operating_hours})")
 
-        # generate arrivals per minute by drawing from poisson distribution
-        for hour, key in zip(range(operating_hours), arrival_seed):
-            arrival_pct = arrival_seed[key]
-            # The first hour with 0 arrivals dictates the park is closed
-            if arrival_pct == 0 and not self.park_close:
-                self.park_close = hour * 60
-
-            total_hour_agents = total_daily_agents * arrival_pct * 0.01 # convert integer pct to decimal
-            expected_minute_agents = total_hour_agents/60
-
-            # enforces randomness across hours but retains reproducibilty
-            rng = np.random.default_rng(self.random_seed+hour) 
-            minute_arrivals = list(rng.poisson(lam=expected_minute_agents, size=60))
+        hourly_arrival_pct = np.array(list(arrival_seed.values()))
 
+        # The first hour with 0 arrivals dictates the park is closed, without one the park closes as the schedule ends
+        closed_hours = np.flatnonzero(hourly_arrival_pct == 0)
+        if len(closed_hours) > 0:
+            self.park_close = int(closed_hours[0]) * 60
+        else:
+            self.park_close = operating_hours * 60
 
-            for minute, arrivals in zip(range(60), minute_arrivals):
-                exact_minute = hour*60 + minute
-                self.schedule.update({exact_minute: arrivals})
+        # generate arrivals per minute by drawing the whole day from poisson distributions at once, each hour's
+        # 60 minutes share its expected arrivals per minute
+        expected_minute_agents = total_daily_agents * hourly_arrival_pct * 0.01 / 60 # convert integer pct to decimal
+        rng = np.random.default_rng(self.random_seed)
+        self.schedule = rng.poisson(lam=expected_minute_agents[:, None], size=(operating_hours, 60)).ravel()
         
         # enfore perfect arrivals
-        random.seed(self.random_seed)
         if perfect_arrivals:
-            actual_total_daily_agents = sum(self.schedule.values())
+            actual_total_daily_agents = int(self.schedule.sum())
             dif = actual_total_daily_agents - total_daily_agents
             if dif > 0:
-                for _ in range(dif):
-                    rng_key = random.choice(list(key for key, val in self.schedule.items() if val>0))
-                    self.schedule[rng_key] -= 1
+                # drop randomly chosen arrivals, each arrival is chosen at most once so no minute goes negative
+                arrival_minutes = np.repeat(np.arange(len(self.schedule)), self.schedule)
+                np.subtract.at(self.schedule, rng.choice(arrival_minutes, size=dif, replace=False), 1)
             if dif < 0:
-                for _ in range(dif*-1):
-                    rng_key = random.choice(list(key for key, val in self.schedule.items() if val>0))
-                    self.schedule[rng_key] += 1
+                # add arrivals to randomly chosen minutes that already have arrivals
+                np.add.at(self.schedule, rng.choice(np.flatnonzero(self.schedule > 0), size=-dif), 1)
                     
-            assert sum(self.schedule.values()) == total_daily_agents
+            assert self.schedule.sum() == total_daily_agents
+
+        # the schedule sets the length of the run
+        self.park_history = ParkHistory(
+            total_attractions=len(self.attraction_list),
+            total_activities=len(self.activity_list),
+            horizon=len(self.schedule),
+        )
 
     def generate_agents(self, behavior_archetype_distribution, exp_ability_pct, exp_wait_threshold, exp_limit):
         """ Take a dictionary of agent behavior archetype distributions. Initializes agents. """
@@ -111,66 +131,92 @@ class Park:
                 "The percent of behavior archetypes does not add up to 100%"
             )
 
-        total_agents = sum(self.schedule.values())
-        for agent_id in range(total_agents):
-            random.seed(self.random_seed + agent_id)
-            exp_ability = random.uniform(0,1) < exp_ability_pct
+        Agent.validate_behavior_archetypes()
 
-            agent = Agent(random_seed=self.random_seed)
+        total_agents = int(self.schedule.sum())
+        activity_names = [activity["name"] for activity in self.activity_list]
+        # seeded once, archetype and age class draws then stream from the same generator for every agent
+        random.seed(self.random_seed)
+        # keyed apart from the arrival schedule's generator so the two never share a stream
+        exp_ability_rng = np.random.default_rng([self.random_seed, 1])
+        exp_ability = (exp_ability_rng.random(total_agents) < exp_ability_pct).tolist()
+        for agent_id in range(total_agents):
+            agent = self.agent_pool.acquire(random_seed=self.random_seed, log_events=self.agent_logs)
             agent.initialize_agent(
                 agent_id=agent_id,
                 behavior_archetype_distribution=behavior_archetype_distribution,
-                exp_ability=exp_ability,
+                exp_ability=exp_ability[agent_id],
                 exp_wait_threshold=exp_wait_threshold,
                 exp_limit=exp_limit,
-                attraction_names=[attraction["name"] for attraction in self.attraction_list], 
-                activity_names=[activity["name"] for activity in self.activity_list], 
+                attraction_index=self.attraction_index, 
+                activity_names=activity_names, 
             ) 
             self.agents.update({agent_id: agent})
 
+    def release_agents(self):
+        """ Returns all agents to the agent pool once a run's results are no longer needed """
+
+        for agent in self.agents.values():
+            self.agent_pool.release(agent)
+        self.agents = {}
+
     def generate_attractions(self):
         """ Initializes attractions """
 
-        self.attraction_list = sorted(self.attraction_list, key=lambda k: k['popularity']) 
         for attraction in self.attraction_list:
             self.attractions.update(
                 {
-                    attraction["name"]: Attraction(attraction_characteristics=attraction)
+                    attraction["name"]: Attraction(
+                        attraction_characteristics=attraction,
+                        attraction_id=self.attraction_index[attraction["name"]],
+                    )
                 }
             )
+        self.attractions_by_id = list(self.attractions.values())
     
     def generate_activities(self):
         """ Initializes activities """
 
-        self.activity_list = sorted(self.activity_list, key=lambda k: k['popularity']) 
         for activity in self.activity_list:
             self.activities.update(
                 {
-                    activity["name"]: Activity(activity_characteristics=activity, random_seed=self.random_seed)
+                    activity["name"]: Activity(
+                        activity_characteristics=activity,
+                        random_seed=self.random_seed,
+                        activity_id=self.activity_index[activity["name"]],
+                    )
                 }
             )
+        self.activities_by_id = list(self.activities.values())
 
     def step(self):
         """ A minute of time passes, update all agents and attractions. """
 
         # allow new arrivals to enter
-        total_arrivals = self.schedule[self.time]
+        total_arrivals = int(self.schedule[self.time])
         for new_arrival_index in range(total_arrivals):
             agent_index = self.arrival_index + new_arrival_index
             self.agents[agent_index].arrive_at_park(time=self.time)
+            self.idle_agent_ids.add(agent_index)
         
         self.arrival_index += total_arrivals
+        self.total_active_agents += total_arrivals
 
         # get idle agents
         idle_agent_ids = self.get_idle_agent_ids()
 
+        # wait times are computed once here and kept current by update_park_state as queues change
+        self.attraction_wait_times = [attraction.get_wait_time() for attraction in self.attractions_by_id]
+
         # get idle activity action
+        park_closed = self.park_close <= self.time
         for agent_id in idle_agent_ids:
             action, location = self.agents[agent_id].make_state_change_decision(
-                attractions_dict=self.attractions, 
-                activities_dict=self.activities, 
+                attractions=self.attractions_by_id, 
+                activities=self.activities_by_id, 
+                attraction_wait_times=self.attraction_wait_times,
                 time=self.time,
-                park_closed=self.park_close<=self.time,
+                park_closed=park_closed,
             )
             if action == "get pass":
                 self.history["distributed_passes"] += 1
@@ -183,39 +229,45 @@ class Park:
             )
             
         # process attractions
-        for attraction_name, attraction in self.attractions.items():
+        for attraction in self.attractions_by_id:
             exiting_agents, loaded_agents = attraction.step(time=self.time, park_close=self.park_close)
             for agent_id in exiting_agents:
-                self.agents[agent_id].agent_exited_attraction(name=attraction_name, time=self.time)
+                self.agents[agent_id].agent_exited_attraction(attraction=attraction, time=self.time)
+                self.mark_idle(agent_id=agent_id)
             for agent_id in loaded_agents:
-                if self.agents[agent_id].state["current_action"] == "browsing":
+                if self.agents[agent_id].current_action == "browsing":
                     # force exit if expedited queue estimate was too high
-                    self.activities[self.agents[agent_id].state["current_location"]].force_exit(agent_id=agent_id)
-                    self.agents[agent_id].agent_exited_activity(
-                        name=self.agents[agent_id].state["current_location"],
-                        time=self.time
-                    )
-                redeem = self.agents[agent_id].agent_boarded_attraction(name=attraction_name, time=self.time)
+                    activity = self.activities_by_id[self.agents[agent_id].current_location]
+                    activity.force_exit(agent_id=agent_id)
+                    self.agents[agent_id].agent_exited_activity(activity=activity, time=self.time)
+                redeem = self.agents[agent_id].agent_boarded_attraction(attraction=attraction, time=self.time)
+                self.idle_agent_ids.discard(agent_id)
                 if redeem:
                     self.history["redeemed_passes"] += 1
+            # activities never touch attractions, so the run timer can be counted down here instead of in a later loop
+            attraction.pass_time()
 
         # process activities
-        for activity_name, activity in self.activities.items():
+        for activity in self.activities_by_id:
             exiting_agents = activity.step(time=self.time)
             for agent_id in exiting_agents:
-                self.agents[agent_id].agent_exited_activity(name=activity_name, time=self.time)
-
-        # update time counters and history
-        for agent in self.agents.values():
-            agent.pass_time()
-        for attraction in self.attractions.values():
-            attraction.pass_time()
-            attraction.store_history(time=self.time)
-        for activity in self.activities.values():
-            activity.pass_time()
-            activity.store_history(time=self.time)
-
-        self.calculate_total_active_agents()
+                self.agents[agent_id].agent_exited_activity(activity=activity, time=self.time)
+                self.mark_idle(agent_id=agent_id)
+
+        # update history
+        self.park_history.store(
+            time=self.time,
+            attractions=self.attractions_by_id,
+            activities=self.activities_by_id,
+            total_active_agents=self.calculate_total_active_agents(),
+        )
+        # history views are cheap to hand out, so they are refreshed every minute and cover any partial run
+        self.park_history.export(
+            attractions=self.attractions_by_id,
+            activities=self.activities_by_id,
+            park_history=self.history,
+            minutes=self.time + 1,
+        )
 
         if self.verbosity == 1 and self.time % 60 == 0:
             self.print_metrics()
@@ -227,65 +279,85 @@ class Park:
     def get_idle_agent_ids(self):
         """ Identifies agents within park who have just arrived, who have exited a ride or who have left an activity """
 
-        idle_agent_ids = [
-            agent_id for agent_id, agent_dict in self.agents.items()
-            if agent_dict.state["within_park"] and agent_dict.state["current_action"] == "idling"
-        ]
+        # sorted so agents decide in the same order every run
+        return sorted(self.idle_agent_ids)
+
+    def mark_idle(self, agent_id):
+        """ Records an agent who has finished at an attraction or activity as idle, unless they have already left
+        the park """
 
-        return idle_agent_ids
+        if self.agents[agent_id].within_park:
+            self.idle_agent_ids.add(agent_id)
     
     def update_park_state(self, agent, action, location, time, attractions):
         """ Updates the agent state, attraction state and activity state based on the action """
 
         if action == "leaving":
-            if agent.state["expedited_pass"]:
-                for attraction in agent.state["expedited_pass"]:
-                    self.attractions[attraction].return_pass(agent.agent_id)
+            if agent.expedited_pass:
+                # iterate over a copy, returning a pass removes it from the agent's list
+                for attraction_id in list(agent.expedited_pass):
+                    attraction = self.attractions_by_id[attraction_id]
+                    attraction.return_pass(agent.agent_id)
                     agent.return_exp_pass(attraction=attraction)
+                    self.attraction_wait_times[attraction_id] = attraction.get_wait_time()
             agent.leave_park(time=time)
+            self.idle_agent_ids.discard(agent.agent_id)
+            self.total_active_agents -= 1
             
-        if action == "traveling":
-            if location in self.attractions:
+        elif action == "traveling":
+            self.idle_agent_ids.discard(agent.agent_id)
+            if isinstance(location, Attraction):
                 agent.enter_queue(attraction=location, time=time)
-                self.attractions[location].add_to_queue(agent_id=agent.agent_id)
-
-            if location in self.activities:
+                location.add_to_queue(agent_id=agent.agent_id)
+                self.attraction_wait_times[location.attraction_id] = location.get_wait_time()
+            else:
                 agent.begin_activity(activity=location, time=time)
-                self.activities[location].add_to_activity(
+                location.add_to_activity(
                     agent_id=agent.agent_id, 
-                    expedited_return_time=agent.state["expedited_return_time"]
+                    time_until_expedited_return=(
+                        agent.min_expedited_return_time - time if agent.min_expedited_return_time is not None else None
+                    )
                 )
 
-        if action == "get pass":
+        elif action == "get pass":
             agent.get_pass(attraction=location, time=time)
-            self.attractions[location].remove_pass()
-            expedited_wait_time = self.attractions[location].add_to_exp_queue(agent_id=agent.agent_id)
-            agent.assign_expedited_return_time(expedited_wait_time=expedited_wait_time)
+            location.remove_pass()
+            expedited_wait_time = location.add_to_exp_queue(agent_id=agent.agent_id)
+            agent.assign_expedited_return_time(expedited_wait_time=expedited_wait_time, time=time)
+            self.attraction_wait_times[location.attraction_id] = location.get_wait_time()
 
     def calculate_total_active_agents(self):
-        """ Counts how many agents are currently active within the park """
+        """ Returns how many agents are currently active within the park """
 
-        active_agents = len([agent_id for agent_id, agent in self.agents.items() if agent.state["within_park"]])
-        self.history["total_active_agents"].update({self.time: active_agents})
+        return self.total_active_agents
 
     def print_metrics(self):
         """ Prints park metrics """
 
         print(f"Time: {self.time}")
-        print(f"Total Agents in Park: {self.history['total_active_agents'][self.time]}")
+        print(f"Total Agents in Park: {self.park_history.total_active_agents[self.time]}")
         print(f"Attraction Wait Times (Minutes):")
         for attraction_name, attraction in self.attractions.items():
-            print(f"     {attraction_name}: {attraction.history['queue_wait_time'][self.time]}")
+            print(
+                f"     {attraction_name}: "
+                f"{self.park_history.queue_wait_time[attraction.attraction_id, self.time]}"
+            )
         print(f"Activity Visitor (Agents):")
         for activity_name, activity in self.activities.items():
-            print(f"     {activity_name}: {activity.history['total_vistors'][self.time]}")
+            print(f"     {activity_name}: {self.park_history.total_visitors[activity.activity_id, self.time]}")
         print(f"{'-'*50}\n")
 
     @staticmethod
-    def make_lineplot(dict_list, x, y, hue, title, location, show=False, y_max=None):
-        """ Create a hued lineplot derived from a list of dictionaries """
+    def save_figure(location):
+        """ Saves the current figure to location, once on a white background and once transparent """
+
+        plt.savefig(location, transparent=False, facecolor="white", bbox_inches="tight")
+        plt.savefig(f"{location} Transparent", transparent=True, bbox_inches="tight")
+
+    @staticmethod
+    def make_lineplot(df, x, y, hue, title, location, show=False, y_max=None):
+        """ Create a hued lineplot derived from a dataframe """
         
-        df = pd.DataFrame(dict_list)
         l = [time for ind, time in enumerate(list(df['Time'].unique())) if ind%60==0]
         plt.figure(figsize=(15,8))
         ax = sns.lineplot(data=df, x=x, y=y, hue=hue)
@@ -293,25 +365,23 @@ class Park:
         ax.tick_params(axis='x', rotation=45)
         if y_max:
             ax.set(ylim=(0, y_max))
-        plt.savefig(location, transparent=False, facecolor="white", bbox_inches="tight")
-        plt.savefig(f"{location} Transparent", transparent=True, bbox_inches="tight")
-        plt.show()
-        if not show:
+        Park.save_figure(location=location)
+        if show:
+            plt.show()
+        else:
             plt.close()
     
     @staticmethod
-    def make_histogram(dict_list, x, title, location, show=False):
-        """ Create a histogram derived from a list of dictionaries """
+    def make_histogram(df, x, title, location, show=False):
+        """ Create a histogram derived from a dataframe """
         
-        df = pd.DataFrame(dict_list)
         l = sorted(list(set(val for val in df[x])))
         plt.figure(figsize=(15,8))
         ax = sns.histplot(data=df, x=x, stat="percent", bins=np.arange(-0.5, len(l))) # weird trick to align labels
         ax.set(title=title, xticks=l, xticklabels=l)
-        plt.savefig(location, transparent=False, facecolor="white", bbox_inches="tight")
-        plt.savefig(f"{location} Transparent", transparent=True, bbox_inches="tight")
-        plt.show()
+        Park.save_figure(location=location)
         if show:
+            plt.show()
             disp_df = pd.DataFrame(df[x].describe()).reset_index()
             disp_df.columns = ["Metric", x]
             print(
@@ -323,14 +393,13 @@ class Park:
                     floatfmt=('.2f')
                 )
             )
-        if not show:
+        else:
             plt.close()
     
     @staticmethod
-    def make_barplot(dict_list, x, y, hue, y_max, title, location, estimator=None, show=False):
-        """ Create a hued barplot derived from a list of dictionaries """
+    def make_barplot(df, x, y, hue, y_max, title, location, estimator=None, show=False):
+        """ Create a hued barplot derived from a dataframe """
 
-        df = pd.DataFrame(dict_list)
         plt.figure(figsize=(15,8))
         if estimator:
             ax = sns.barplot(data=df, x=x, y=y, hue=hue, ci=None, estimator=estimator)
@@ -339,29 +408,29 @@ class Park:
         ax.set(title=title)
         if y_max:
             ax.set(ylim=(0, y_max))
-        plt.savefig(location, transparent=False, facecolor="white", bbox_inches="tight")
-        plt.savefig(f"{location} Transparent", transparent=True, bbox_inches="tight")
-        plt.show()
-        if show and not estimator:
-            print(
-                tabulate(
-                    df.sort_values(hue), 
-                    headers='keys', 
-                    tablefmt='psql', 
-                    showindex=False,
-                    floatfmt=('.2f')
+        Park.save_figure(location=location)
+        if show:
+            plt.show()
+            if not estimator:
+                print(
+                    tabulate(
+                        df.sort_values(hue), 
+                        headers='keys', 
+                        tablefmt='psql', 
+                        showindex=False,
+                        floatfmt=('.2f')
+                    )
                 )
-            )
-        if show and estimator==sum:
-            print(
-                tabulate(
-                    df.groupby(x).sum().reset_index(),
-                    headers='keys', 
-                    tablefmt='psql', 
-                    showindex=False,
+            if estimator==sum:
+                print(
+                    tabulate(
+                        df.groupby(x).sum().reset_index(),
+                        headers='keys', 
+                        tablefmt='psql', 
+                        showindex=False,
+                    )
                 )
-            )
-        if not show:
+        else:
             plt.close()
              
 
@@ -372,116 +441,176 @@ class Park:
         if not os.path.exists(version_path):
             os.mkdir(version_path)
 
-        # Attractions
-        queue_length = []
-        queue_wait_time = []
-        exp_queue_length = []
-        exp_queue_wait_time = []
-        for attraction_name, attraction in self.attractions.items():
-            for time, val in attraction.history["queue_length"].items():
-                queue_length.append({"Time": time, "Agents": val, "Attraction": attraction_name})
-            for time, val in attraction.history["queue_wait_time"].items():
-                queue_wait_time.append({"Time": time, "Minutes": val, "Attraction": attraction_name})
-            for time, val in attraction.history["exp_queue_length"].items():
-                exp_queue_length.append({"Time": time, "Agents": val, "Attraction": attraction_name})
-            for time, val in attraction.history["exp_queue_wait_time"].items():
-                exp_queue_wait_time.append({"Time": time, "Minutes": val, "Attraction": attraction_name})
+        # metrics for the minutes run so far, one row per attraction or activity id
+        minutes = self.time
+        times = np.arange(minutes)
+        queue_lengths = self.park_history.queue_length[:, :minutes]
+        queue_wait_times = self.park_history.queue_wait_time[:, :minutes]
+        exp_queue_lengths = self.park_history.exp_queue_length[:, :minutes]
+        exp_queue_wait_times = self.park_history.exp_queue_wait_time[:, :minutes]
+        total_visitors = self.park_history.total_visitors[:, :minutes]
+        total_active_agents = self.park_history.total_active_agents[:minutes]
+
+        # Attractions, one frame per attraction built straight from its history arrays
+        queue_length = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "Time": times,
+                        "Agents": queue_lengths[attraction.attraction_id],
+                        "Attraction": attraction_name
+                    }
+                )
+                for attraction_name, attraction in self.attractions.items()
+            ],
+            ignore_index=True
+        )
+        queue_wait_time = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "Time": times,
+                        "Minutes": queue_wait_times[attraction.attraction_id],
+                        "Attraction": attraction_name
+                    }
+                )
+                for attraction_name, attraction in self.attractions.items()
+            ],
+            ignore_index=True
+        )
+        exp_queue_length = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "Time": times,
+                        "Agents": exp_queue_lengths[attraction.attraction_id],
+                        "Attraction": attraction_name
+                    }
+                )
+                for attraction_name, attraction in self.attractions.items()
+            ],
+            ignore_index=True
+        )
+        exp_queue_wait_time = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "Time": times,
+                        "Minutes": exp_queue_wait_times[attraction.attraction_id],
+                        "Attraction": attraction_name
+                    }
+                )
+                for attraction_name, attraction in self.attractions.items()
+            ],
+            ignore_index=True
+        )
         
         avg_queue_wait_time = []
         for attraction_name, attraction in self.attractions.items():
-            queue_wait_list = [
-                val for time, val in attraction.history["queue_wait_time"].items()
-                if time <= self.park_close
-            ]
-            exp_queue_wait_list = [
-                val for time, val in attraction.history["exp_queue_wait_time"].items()
-                if time <= self.park_close
-            ]
             avg_queue_wait_time.append(
                 {
                     "Attraction": attraction_name,
-                    "Average Wait Time": sum(queue_wait_list)/len(queue_wait_list),
+                    "Average Wait Time": float(
+                        queue_wait_times[attraction.attraction_id, :self.park_close+1].mean()
+                    ),
                     "Queue Type": "Standby"
                 }
             )
             avg_queue_wait_time.append(
                 {
                     "Attraction": attraction_name,
-                    "Average Wait Time": sum(exp_queue_wait_list)/len(exp_queue_wait_list),
+                    "Average Wait Time": float(
+                        exp_queue_wait_times[attraction.attraction_id, :self.park_close+1].mean()
+                    ),
                     "Queue Type": "Expedited"
                 }
             )
+        avg_queue_wait_time = pd.DataFrame(avg_queue_wait_time)
 
         # Activities
-        total_vistors = []
-        for activity_name, activity in self.activities.items():
-            for time, val in activity.history["total_vistors"].items():
-                total_vistors.append({"Time": time, "Agents": val, "Activity": activity_name})
+        total_vistors = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "Time": times,
+                        "Agents": total_visitors[activity.activity_id],
+                        "Activity": activity_name
+                    }
+                )
+                for activity_name, activity in self.activities.items()
+            ],
+            ignore_index=True
+        )
 
-        # Agent Distribution
-        broad_agent_distribution = []
-        for time, total_agents in self.history["total_active_agents"].items():
-            broad_agent_distribution.append(
-                {
-                    "Time": time,
-                    "Approximate Percent": sum(
-                        [attraction.history["queue_length"][time] for attraction in self.attractions.values()]
-                    )/total_agents if total_agents > 0 else 0,
-                    "Type": "Attractions"
-                }
+        # Agent Distribution, minutes with nobody in the park count as 0
+        attraction_share = np.divide(
+            queue_lengths, total_active_agents, out=np.zeros(queue_lengths.shape), where=total_active_agents > 0
         )
-            broad_agent_distribution.append(
-                {
-                    "Time": time,
-                    "Approximate Percent": sum(
-                        [activity.history["total_vistors"][time] for activity in self.activities.values()]
-                    )/total_agents if total_agents > 0 else 0,
-                    "Type": "Activities"
-                }
+        activity_share = np.divide(
+            total_visitors, total_active_agents, out=np.zeros(total_visitors.shape), where=total_active_agents > 0
         )
-            
-        specific_agent_distribution = []
-        for time, total_agents in self.history["total_active_agents"].items():
-            for attraction_name, attraction in self.attractions.items():
-                specific_agent_distribution.append(
+
+        broad_agent_distribution = pd.concat(
+            [
+                pd.DataFrame(
                     {
-                        "Time": time,
-                        "Approximate Percent": attraction.history["queue_length"][time]/total_agents if total_agents > 0 else 0,
-                        "Type": attraction_name
+                        "Time": times,
+                        "Approximate Percent": np.divide(
+                            queue_lengths.sum(axis=0),
+                            total_active_agents,
+                            out=np.zeros(minutes),
+                            where=total_active_agents > 0
+                        ),
+                        "Type": "Attractions"
                     }
-            )
-            for activity_name, activity in self.activities.items():
-                specific_agent_distribution.append(
+                ),
+                pd.DataFrame(
                     {
-                        "Time": time,
-                        "Approximate Percent": activity.history["total_vistors"][time]/total_agents if total_agents > 0 else 0,
-                        "Type": activity_name
+                        "Time": times,
+                        "Approximate Percent": np.divide(
+                            total_visitors.sum(axis=0),
+                            total_active_agents,
+                            out=np.zeros(minutes),
+                            where=total_active_agents > 0
+                        ),
+                        "Type": "Activities"
                     }
-            )
+                ),
+            ],
+            ignore_index=True
+        )
+            
+        specific_agent_distribution = pd.concat(
+            [
+                pd.DataFrame({"Time": times, "Approximate Percent": attraction_share[ind], "Type": attraction_name})
+                for attraction_name, ind in self.attraction_index.items()
+            ]
+            + [
+                pd.DataFrame({"Time": times, "Approximate Percent": activity_share[ind], "Type": activity_name})
+                for activity_name, ind in self.activity_index.items()
+            ],
+            ignore_index=True
+        )
 
 
-        attraction_counter = []
-        attraction_density = []
-        for agent_id, agent in self.agents.items():
-            attraction_counter.append(
-                {
-                    "Agent": agent_id,
-                    "Behavior": agent.behavior["archetype"],
-                    "Total Attractions Visited": sum(
-                        attraction['times_completed'] for attraction in agent.state["attractions"].values()
-                    )
-                }
-            )
-            for attraction, attraction_dict in agent.state["attractions"].items():
-                attraction_density.append(
-                    {
-                        "Attraction": attraction,
-                        "Visits": attraction_dict["times_completed"]
-                    }
-                )
+        # one row of ride counts per agent, columns ordered by attraction id
+        attractions_completed = np.array([agent.attractions_completed for agent in self.agents.values()])
+        attraction_counter = pd.DataFrame(
+            {
+                "Agent": list(self.agents.keys()),
+                "Behavior": [agent.behavior_archetype for agent in self.agents.values()],
+                "Total Attractions Visited": attractions_completed.sum(axis=1)
+            }
+        )
+        attraction_density = pd.DataFrame(
+            {
+                "Attraction": np.tile(list(self.attraction_index), len(attractions_completed)),
+                "Visits": attractions_completed.ravel()
+            }
+        )
 
         self.make_lineplot(
-            dict_list=queue_length, 
+            df=queue_length, 
             x="Time", 
             y="Agents", 
             hue="Attraction",
@@ -492,7 +621,7 @@ class Park:
         )
 
         self.make_lineplot(
-            dict_list=queue_wait_time, 
+            df=queue_wait_time, 
             x="Time", 
             y="Minutes", 
             hue="Attraction",
@@ -503,7 +632,7 @@ class Park:
         )
 
         self.make_lineplot(
-            dict_list=exp_queue_length, 
+            df=exp_queue_length, 
             x="Time", 
             y="Agents", 
             hue="Attraction",
@@ -514,7 +643,7 @@ class Park:
         )
 
         self.make_lineplot(
-            dict_list=exp_queue_wait_time, 
+            df=exp_queue_wait_time, 
             x="Time", 
             y="Minutes", 
             hue="Attraction",
@@ -525,7 +654,7 @@ class Park:
         )
 
         self.make_lineplot(
-            dict_list=total_vistors, 
+            df=total_vistors, 
             x="Time", 
             y="Agents", 
             hue="Activity",
@@ -536,7 +665,7 @@ class Park:
         )
 
         self.make_lineplot(
-            dict_list=broad_agent_distribution, 
+            df=broad_agent_distribution, 
             x="Time", 
             y="Approximate Percent", 
             hue="Type",
@@ -547,7 +676,7 @@ class Park:
         )
 
         self.make_lineplot(
-            dict_list=specific_agent_distribution, 
+            df=specific_agent_distribution, 
             x="Time", 
             y="Approximate Percent", 
             hue="Type",
@@ -558,7 +687,7 @@ class Park:
         )
 
         self.make_barplot(
-            dict_list=avg_queue_wait_time, 
+            df=avg_queue_wait_time, 
             x="Attraction", 
             y="Average Wait Time", 
             hue="Queue Type",
@@ -569,7 +698,7 @@ class Park:
         )
 
         self.make_histogram(
-            dict_list=attraction_counter, 
+            df=attraction_counter, 
             x="Total Attractions Visited", 
             title="Agent Attractions Histogram", 
             location=f"{self.version}/Agent Attractions Histogram",
@@ -577,7 +706,7 @@ class Park:
         )
 
         self.make_barplot(
-            dict_list=attraction_density, 
+            df=attraction_density, 
             x="Attraction", 
             y="Visits", 
             hue=None,
@@ -589,7 +718,7 @@ class Park:
         )
 
         self.make_barplot(
-            dict_list= [
+            df=pd.DataFrame([
                 {   
                     "Expedited Passes": " ",
                     "Total Passes": self.history["distributed_passes"],
@@ -600,7 +729,7 @@ class Park:
                     "Total Passes": self.history["redeemed_passes"],
                     "Type": "Redeemed"
                 }
-            ], 
+            ]), 
             x="Expedited Passes", 
             y="Total Passes",
             hue="Type", 
@@ -609,24 +738,25 @@ class Park:
             location=f"{self.version}/Expedited Pass Distribution", 
             show=show
         )
+        age_class_counts = Counter(agent.age_class for agent in self.agents.values())
         self.make_barplot(
-            dict_list= [
+            df=pd.DataFrame([
                 {   
                     "Age Class": " ",
-                    "Agents": len([agent_id for agent_id, agent in self.agents.items() if agent.state["age_class"] == "no_child_rides"]),
+                    "Agents": age_class_counts["no_child_rides"],
                     "Type": "No Child Rides"
                 },
                 {
                     "Age Class": " ",
-                    "Agents": len([agent_id for agent_id, agent in self.agents.items() if agent.state["age_class"] == "no_adult_rides"]),
+                    "Agents": age_class_counts["no_adult_rides"],
                     "Type": "No Adult Rides"
                 },
                 {
                     "Age Class": " ",
-                    "Agents": len([agent_id for agent_id, agent in self.agents.items() if agent.state["age_class"] == "no_preference"]),
+                    "Agents": age_class_counts["no_preference"],
                     "Type": "No Preference"
                 },
-            ], 
+            ]), 
             x="Age Class", 
             y="Agents",
             hue="Type", 
@@ -645,8 +775,17 @@ class Park:
             selected_agent_ids = random.sample(all_agent_ids, N)
         for agent_id in selected_agent_ids:
             print(f"Agent ID: {agent_id}")
-            print(f"Agent Archetype: {self.agents[agent_id].behavior['archetype']}")
-            print(f"{self.agents[agent_id].log}\n")
+            print(f"Agent Archetype: {self.agents[agent_id].behavior_archetype}")
+            print(f"{self.agents[agent_id].get_log()}\n")
+
+    @staticmethod
+    def json_default(obj):
+        """ Writes read only mappings such as BEHAVIOR_ARCHETYPE_PARAMETERS as plain objects, anything else json
+        can't serialize is an error """
+
+        if isinstance(obj, MappingProxyType):
+            return dict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
     @staticmethod
     def write_data_to_file(data, output_file_path, output_file_format):
@@ -666,7 +805,7 @@ class Park:
             raise ValueError("full_path must be specified")
 
         writers = {
-            "json": lambda file_writer: json.dump(data, file_writer, indent=2),
+            "json": lambda file_writer: json.dump(data, file_writer, indent=2, default=Park.json_default),
         }
         writers[output_file_format](file_writer)
         file_writer.close()
\ No newline at end of file
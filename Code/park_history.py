@@ -0,0 +1,51 @@
+import numpy as np
+
+class ParkHistory:
+    """ Records park, attraction and activity metrics for every minute of a park run. Attraction and activity
+    metrics are arrays with a row per attraction or activity, indexed by id, and a column per minute. """
+
+    __slots__ = (
+        "horizon", "queue_length", "queue_wait_time", "exp_queue_length", "exp_queue_wait_time", "total_visitors",
+        "total_active_agents",
+    )
+
+    def __init__(self, total_attractions, total_activities, horizon):
+        """
+        Required Inputs:
+            total_attractions: number of attractions in the park
+            total_activities: number of activities in the park
+            horizon: number of minutes in the run
+        """
+
+        self.horizon = horizon
+        self.queue_length = np.zeros((total_attractions, horizon), dtype=np.int32)
+        self.queue_wait_time = np.zeros((total_attractions, horizon), dtype=np.int32)
+        self.exp_queue_length = np.zeros((total_attractions, horizon), dtype=np.int32)
+        self.exp_queue_wait_time = np.zeros((total_attractions, horizon), dtype=np.int32)
+        self.total_visitors = np.zeros((total_activities, horizon), dtype=np.int32)
+        self.total_active_agents = np.zeros(horizon, dtype=np.int32)
+
+    def store(self, time, attractions, activities, total_active_agents):
+        """ Takes lists of attractions and activities ordered by id and the number of agents in the park. Stores
+        the metrics for the minute. """
+
+        self.queue_length[:, time] = [attraction.queue_length for attraction in attractions]
+        self.queue_wait_time[:, time] = [attraction.get_wait_time() for attraction in attractions]
+        self.exp_queue_length[:, time] = [attraction.exp_queue_length for attraction in attractions]
+        self.exp_queue_wait_time[:, time] = [attraction.get_exp_wait_time() for attraction in attractions]
+        self.total_visitors[:, time] = [activity.total_visitors for activity in activities]
+        self.total_active_agents[time] = total_active_agents
+
+    def export(self, attractions, activities, park_history, minutes):
+        """ Points the history of the attractions, activities and park at the first minutes of each metric. Each
+        series is a view into these arrays indexed by minute, nothing is copied. """
+
+        for attraction in attractions:
+            ind = attraction.attraction_id
+            attraction.history["queue_length"] = self.queue_length[ind, :minutes]
+            attraction.history["queue_wait_time"] = self.queue_wait_time[ind, :minutes]
+            attraction.history["exp_queue_length"] = self.exp_queue_length[ind, :minutes]
+            attraction.history["exp_queue_wait_time"] = self.exp_queue_wait_time[ind, :minutes]
+        for activity in activities:
+            activity.history["total_vistors"] = self.total_visitors[activity.activity_id, :minutes]
+        park_history["total_active_agents"] = self.total_active_agents[:minutes]